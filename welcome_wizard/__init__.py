@@ -32,10 +32,19 @@ class WelcomeWizardConfig(NautobotAppConfig):
         """Callback when this plugin is loaded."""
         super().ready()
 
+        from django.db.models.signals import post_delete, post_save  # pylint: disable=import-outside-toplevel
         from nautobot.core.signals import nautobot_database_ready  # pylint: disable=import-outside-toplevel
-        from .signals import nautobot_database_ready_callback  # pylint: disable=import-outside-toplevel
+        from nautobot.extras.models import GitRepository, Job  # pylint: disable=import-outside-toplevel
+        from .signals import (  # pylint: disable=import-outside-toplevel
+            devicetype_library_deleted_callback,
+            job_changed_callback,
+            nautobot_database_ready_callback,
+        )
 
         nautobot_database_ready.connect(nautobot_database_ready_callback, sender=self)
+        post_delete.connect(devicetype_library_deleted_callback, sender=GitRepository)
+        post_save.connect(job_changed_callback, sender=Job)
+        post_delete.connect(job_changed_callback, sender=Job)
 
 
 config = WelcomeWizardConfig  # pylint:disable=invalid-name
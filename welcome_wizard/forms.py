@@ -28,10 +28,14 @@ class DeviceTypeImportFilterForm(BootstrapMixin, CustomFieldFilterForm):
 class ManufacturerBulkImportForm(BootstrapMixin, forms.Form):
     """Bulk Import Form for Manufacturer."""
 
-    pk = forms.ModelMultipleChoiceField(queryset=ManufacturerImport.objects.all(), widget=forms.MultipleHiddenInput)
+    # Validation only needs to confirm the selected objects exist, so don't load their other columns.
+    pk = forms.ModelMultipleChoiceField(
+        queryset=ManufacturerImport.objects.only("pk"), widget=forms.MultipleHiddenInput
+    )
 
 
 class DeviceTypeBulkImportForm(BootstrapMixin, forms.Form):
     """Bulk Import Form for Device Type."""
 
-    pk = forms.ModelMultipleChoiceField(queryset=DeviceTypeImport.objects.all(), widget=forms.MultipleHiddenInput)
+    # Validation only needs to confirm the selected objects exist, so don't load their other columns.
+    pk = forms.ModelMultipleChoiceField(queryset=DeviceTypeImport.objects.only("pk"), widget=forms.MultipleHiddenInput)
@@ -1,7 +1,10 @@
 """Signal handlers for welcome_wizard."""
 
+from django.core.cache import cache
 from nautobot.extras.models import Job
 
+from welcome_wizard.utils import SYNC_DONE_CACHE_KEY, job_cache_key
+
 
 def nautobot_database_ready_callback(sender, *, apps, **kwargs):  # pylint: disable=unused-argument
     """Callback function triggered by the nautobot_database_ready signal when the Nautobot database is fully ready."""
@@ -11,3 +14,14 @@ def nautobot_database_ready_callback(sender, *, apps, **kwargs):  # pylint: disa
         job = Job.objects.get(job_class_name=job_class)
         job.enabled = True
         job.save()
+
+
+def devicetype_library_deleted_callback(sender, *, instance, **kwargs):  # pylint: disable=unused-argument
+    """Callback function triggered when a GitRepository is deleted, so the Device Type Library can be synced again."""
+    if instance.slug == "devicetype_library":
+        cache.delete(SYNC_DONE_CACHE_KEY)
+
+
+def job_changed_callback(sender, *, instance, **kwargs):  # pylint: disable=unused-argument
+    """Callback function triggered when a Job is saved or deleted, so the cached copy is not used anymore."""
+    cache.delete(job_cache_key(instance.name))
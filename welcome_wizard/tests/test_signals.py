@@ -0,0 +1,66 @@
+"""Tests for Welcome Wizard Signals."""
+
+from django.core.cache import cache
+from nautobot.apps.testing import TransactionTestCase
+from nautobot.extras.models import GitRepository, Job
+
+from welcome_wizard.utils import SYNC_DONE_CACHE_KEY, get_job, job_cache_key
+
+
+class DeviceTypeLibraryDeletedTestCase(TransactionTestCase):
+    """Tests the devicetype_library_deleted_callback signal handler."""
+
+    def setUp(self):
+        super().setUp()
+        cache.set(SYNC_DONE_CACHE_KEY, True)
+        self.addCleanup(cache.delete, SYNC_DONE_CACHE_KEY)
+
+    def test_devicetype_library_deleted(self):
+        """Deleting the Device Type Library repository allows it to be synced again."""
+        repo = GitRepository.objects.create(
+            name="Devicetype-library",
+            slug="devicetype_library",
+            remote_url="https://github.com/netbox-community/devicetype-library.git",
+            branch="master",
+        )
+        repo.delete()
+        self.assertIsNone(cache.get(SYNC_DONE_CACHE_KEY))
+
+    def test_other_repository_deleted(self):
+        """Deleting another repository keeps the Device Type Library sync remembered."""
+        repo = GitRepository.objects.create(
+            name="Other",
+            slug="other",
+            remote_url="https://example.com/other.git",
+            branch="main",
+        )
+        repo.delete()
+        self.assertTrue(cache.get(SYNC_DONE_CACHE_KEY))
+
+
+class JobChangedTestCase(TransactionTestCase):
+    """Tests the job_changed_callback signal handler."""
+
+    job_name = "Welcome Wizard - Import Manufacturer"
+
+    def setUp(self):
+        super().setUp()
+        cache.delete(job_cache_key(self.job_name))
+        self.addCleanup(cache.delete, job_cache_key(self.job_name))
+
+    def test_get_job_cached(self):
+        """The Job is cached on first lookup."""
+        job = get_job(self.job_name)
+        self.assertEqual(cache.get(job_cache_key(self.job_name)).pk, job.pk)
+
+    def test_job_saved(self):
+        """Saving the Job removes the cached copy."""
+        job = get_job(self.job_name)
+        job.save()
+        self.assertIsNone(cache.get(job_cache_key(self.job_name)))
+
+    def test_job_deleted(self):
+        """Deleting the Job removes the cached copy."""
+        get_job(self.job_name)
+        Job.objects.get(name=self.job_name).delete()
+        self.assertIsNone(cache.get(job_cache_key(self.job_name)))
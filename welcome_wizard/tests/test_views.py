@@ -1,18 +1,26 @@
 """Tests for Welcome Wizard Views."""
 
+from unittest.mock import patch
+
 from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
 from django.test import Client, override_settings
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from nautobot.apps.testing import TransactionTestCase
 from nautobot.core.testing.utils import extract_form_failures
 from nautobot.core.testing.views import TestCase
 from nautobot.core.utils import permissions
 from nautobot.dcim.models import DeviceType, Location, LocationType, Manufacturer
-from nautobot.extras.models import Status
+from nautobot.extras.models import GitRepository, Status
 from nautobot.users import models as users_models
 from nautobot.virtualization.models import Cluster, ClusterType
 
 from welcome_wizard.models.importer import DeviceTypeImport, ManufacturerImport
+from welcome_wizard.models.merlin import Merlin
+from welcome_wizard.utils import SYNC_DONE_CACHE_KEY
+from welcome_wizard.views import DASHBOARD_CACHE_KEYS, dashboard_cache_key
 
 User = get_user_model()
 
@@ -151,6 +159,23 @@ class ManufacturerTestCase(TransactionTestCase, WizardTestCaseMixin):
         response = self.client.get(f'{reverse("plugins:welcome_wizard:manufacturer_import")}?pk={lookup_key}')
         self.assertHttpStatus(response, 200)
 
+    def test_manufacturer_bulk_import_get_not_found(self):
+        self.add_permissions(
+            "dcim.add_manufacturer", "dcim.view_manufacturer", "welcome_wizard.view_manufacturerimport"
+        )
+        response = self.client.get(
+            f'{reverse("plugins:welcome_wizard:manufacturer_import")}?pk=00000000-0000-0000-0000-000000000000',
+            follow=True,
+        )
+        self.assertRedirects(response, reverse("plugins:welcome_wizard:manufacturers"), status_code=302)
+
+    def test_manufacturer_bulk_import_get_invalid(self):
+        self.add_permissions(
+            "dcim.add_manufacturer", "dcim.view_manufacturer", "welcome_wizard.view_manufacturerimport"
+        )
+        response = self.client.get(f'{reverse("plugins:welcome_wizard:manufacturer_import")}?pk=not-a-uuid')
+        self.assertHttpStatus(response, 400)
+
     def test_manufacturer_bulk_import_get_empty(self):
         self.add_permissions(
             "dcim.add_manufacturer", "dcim.view_manufacturer", "welcome_wizard.view_manufacturerimport"
@@ -165,6 +190,28 @@ class ManufacturerTestCase(TransactionTestCase, WizardTestCaseMixin):
         response = self.client.get(reverse("plugins:welcome_wizard:manufacturers"))
         self.assertHttpStatus(response, 200)
 
+    @patch("welcome_wizard.views.enqueue_pull_git_repository_and_refresh_data")
+    def test_manufacturer_list_sync_once(self, mock_enqueue):
+        """Tests the Device Type Library sync is only enqueued once from the list view."""
+        cache.delete(SYNC_DONE_CACHE_KEY)
+        self.addCleanup(cache.delete, SYNC_DONE_CACHE_KEY)
+        self.add_permissions("welcome_wizard.view_manufacturerimport")
+        self.assertHttpStatus(self.client.get(reverse("plugins:welcome_wizard:manufacturers")), 200)
+        self.assertHttpStatus(self.client.get(reverse("plugins:welcome_wizard:manufacturers")), 200)
+        mock_enqueue.assert_called_once()
+        self.assertTrue(GitRepository.objects.filter(slug="devicetype_library").exists())
+
+    @patch("welcome_wizard.views.enqueue_pull_git_repository_and_refresh_data")
+    def test_manufacturer_list_sync_not_remembered_without_repository(self, mock_enqueue):
+        """Tests existing import data without the repository does not skip later checks."""
+        cache.delete(SYNC_DONE_CACHE_KEY)
+        self.addCleanup(cache.delete, SYNC_DONE_CACHE_KEY)
+        ManufacturerImport.objects.create(name="Onyx")
+        self.add_permissions("welcome_wizard.view_manufacturerimport")
+        self.assertHttpStatus(self.client.get(reverse("plugins:welcome_wizard:manufacturers")), 200)
+        mock_enqueue.assert_not_called()
+        self.assertIsNone(cache.get(SYNC_DONE_CACHE_KEY))
+
     def test_manufacturer_list_permission_denied(self):
         """Tests the ManufacturerImport List View with no permissions."""
         response = self.client.get(reverse("plugins:welcome_wizard:manufacturers"))
@@ -244,6 +291,29 @@ class DeviceTypeTestCase(TransactionTestCase, WizardTestCaseMixin):
         response = self.client.post(reverse("plugins:welcome_wizard:devicetype_import"), data=data, follow=True)
         self.assertHttpStatus(response, 200)
 
+    @patch("welcome_wizard.views.JobResult.enqueue_job")
+    def test_devicetype_bulk_import_skips_device_type_data(self, mock_enqueue):
+        """Tests the DeviceTypeImport Bulk Import View does not load device_type_data for the selected objects."""
+        manufacturer = ManufacturerImport.objects.create(name="Generic")
+        DeviceTypeImport.objects.create(
+            name="shelf-2he",
+            filename="shelf-2he.yaml",
+            manufacturer=manufacturer,
+            device_type_data={
+                "manufacturer": "Generic",
+                "model": "shelf-2he",
+                "u_height": 2,
+                "full_depth": False,
+            },
+        )
+        self.add_permissions("dcim.add_devicetype", "welcome_wizard.view_devicetypeimport")
+        data = {"pk": [DeviceTypeImport.objects.first().pk]}
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.post(reverse("plugins:welcome_wizard:devicetype_import"), data=data)
+        self.assertHttpStatus(response, 302)
+        self.assertFalse([query["sql"] for query in queries if "device_type_data" in query["sql"]])
+        self.assertEqual(mock_enqueue.call_args.kwargs["filename"], "shelf-2he.yaml")
+
     def test_devicetype_list(self):
         """Tests the DeviceTypeImport List View with correct pemissions."""
         self.add_permissions("welcome_wizard.view_devicetypeimport")
@@ -298,6 +368,8 @@ class DashboardView(TransactionTestCase):
 
     def setUp(self):
         self.active_status, _ = Status.objects.get_or_create(name="Active")
+        # Results cached by earlier tests would outlive their (now flushed) data.
+        cache.delete_many(DASHBOARD_CACHE_KEYS.values())
         super().setUp()
 
     def test_dashboard_view_no_entries(self):
@@ -328,6 +400,32 @@ class DashboardView(TransactionTestCase):
         self.assertContains(resp, "mdi-checkbox-blank-outline", 6)
         self.assertContains(resp, "mdi-checkbox-marked-outline", 2)
 
+    def test_dashboard_view_updates_existing_entries(self):
+        """Test repeated dashboard loads update the Merlin entries instead of duplicating them."""
+        self.add_permissions("welcome_wizard.view_merlin")
+        url = reverse("plugins:welcome_wizard:dashboard")
+        self.assertHttpStatus(self.client.get(url), 200)
+        self.assertEqual(Merlin.objects.count(), 8)
+        self.assertFalse(Merlin.objects.get(name="Manufacturers").completed)
+
+        Manufacturer.objects.create(name="Manufacturer1")
+        self.assertHttpStatus(self.client.get(url), 200)
+        self.assertEqual(Merlin.objects.count(), 8)
+        self.assertTrue(Merlin.objects.get(name="Manufacturers").completed)
+        self.assertTrue(cache.get(dashboard_cache_key(Manufacturer)))
+        self.assertIsNone(cache.get(dashboard_cache_key(Location)))
+
+    def test_dashboard_view_refreshes_links(self):
+        """Test stale links on existing Merlin entries are refreshed without resetting ignored."""
+        self.add_permissions("welcome_wizard.view_merlin")
+        Merlin.objects.create(name="Locations", ignored=True, nautobot_add_link="dcim:site_add")
+        resp = self.client.get(reverse("plugins:welcome_wizard:dashboard"))
+        self.assertHttpStatus(resp, 200)
+        merlin = Merlin.objects.get(name="Locations")
+        self.assertEqual(merlin.nautobot_add_link, "dcim:location_add")
+        self.assertEqual(merlin.nautobot_list_link, "dcim:location_list")
+        self.assertTrue(merlin.ignored)
+
     def test_dashboard_view_permission_denied(self):
         """Test failed connection."""
         url = reverse("plugins:welcome_wizard:dashboard")
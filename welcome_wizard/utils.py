@@ -0,0 +1,24 @@
+"""Cache helpers shared by the Welcome Wizard views and signal handlers."""
+from django.core.cache import cache
+from nautobot.extras.models import Job
+
+# Set once the Device Type Library repository exists or its sync has been enqueued.
+SYNC_DONE_CACHE_KEY = "welcome_wizard.devicetype_library.synced"
+# How long (in seconds) the repository check is skipped, kept finite as the cache outlives database resets.
+SYNC_DONE_CACHE_TIMEOUT = 300
+# How long (in seconds) an import Job is cached, kept short as the cache outlives database resets.
+JOB_CACHE_TIMEOUT = 60
+
+
+def job_cache_key(name):
+    """Return the cache key used to remember the Job called `name`."""
+    return f"welcome_wizard.job.{name}"
+
+
+def get_job(name):
+    """Return the Job called `name`, cached for `JOB_CACHE_TIMEOUT` seconds or until that Job is saved or deleted."""
+    job = cache.get(job_cache_key(name))
+    if job is None:
+        job = Job.objects.get(name=name)
+        cache.set(job_cache_key(name), job, JOB_CACHE_TIMEOUT)
+    return job
@@ -1,18 +1,21 @@
 """Views for Welcome Wizard."""
+from uuid import UUID
+
 from django import forms
 from django.conf import settings
 from django.contrib import messages
-from django.http import HttpResponseForbidden
+from django.core.cache import cache
+from django.db import connection
+from django.http import HttpResponseBadRequest, HttpResponseForbidden
 from django.shortcuts import redirect, render
 from django.views.generic import View
 from nautobot.circuits.models import CircuitType, Provider
-from nautobot.core.utils.permissions import get_permission_for_model
 from nautobot.core.views import generic
 from nautobot.core.views.mixins import ObjectPermissionRequiredMixin
 from nautobot.dcim.models import DeviceType, Location, Manufacturer
 from nautobot.extras.models import Role
 from nautobot.extras.datasources import enqueue_pull_git_repository_and_refresh_data
-from nautobot.extras.models import GitRepository, Job, JobResult
+from nautobot.extras.models import GitRepository, JobResult
 from nautobot.ipam.models import RIR
 from nautobot.virtualization.models import ClusterType
 
@@ -26,26 +29,110 @@ from welcome_wizard.forms import (
 from welcome_wizard.models.importer import DeviceTypeImport, ManufacturerImport
 from welcome_wizard.models.merlin import Merlin
 from welcome_wizard.tables import DashboardTable, DeviceTypeWizardTable, ManufacturerWizardTable
+from welcome_wizard.utils import SYNC_DONE_CACHE_KEY, SYNC_DONE_CACHE_TIMEOUT, get_job
+
+# Entries shown on the dashboard: (Nautobot model, name, list view, add view, Welcome Wizard import view).
+# To not have a Merlin import set the import view to an empty string `""` so that it will not be processed link wise.
+DASHBOARD_ENTRIES = (
+    (Location, "Locations", "dcim:location_list", "dcim:location_add", ""),
+    (
+        Manufacturer,
+        "Manufacturers",
+        "dcim:manufacturer_list",
+        "dcim:manufacturer_add",
+        "plugins:welcome_wizard:manufacturer_import",
+    ),
+    (
+        DeviceType,
+        "Device Types",
+        "dcim:devicetype_list",
+        "dcim:devicetype_add",
+        "plugins:welcome_wizard:devicetype_import",
+    ),
+    (
+        Role,
+        "Roles",
+        "extras:role_list",
+        "extras:role_add",
+        "",
+    ),
+    (
+        CircuitType,
+        "Circuit Types",
+        "circuits:circuittype_list",
+        "circuits:circuittype_add",
+        "",
+    ),
+    (
+        Provider,
+        "Circuit Providers",
+        "circuits:provider_list",
+        "circuits:provider_add",
+        "",
+    ),
+    (RIR, "RIRs", "ipam:rir_list", "ipam:rir_add", ""),
+    (
+        ClusterType,
+        "VM Cluster Types",
+        "virtualization:clustertype_list",
+        "virtualization:clustertype_add",
+        "",
+    ),
+)
 
+# How long (in seconds) a model is remembered as having data when rendering the dashboard.
+DASHBOARD_CACHE_TIMEOUT = 30
 
-def check_sync(instance, request):
-    """If Device Type Library is enabled and no data in queryset, run the sync."""
-    if settings.PLUGINS_CONFIG["welcome_wizard"].get("enable_devicetype-library") and not instance.queryset.exists():
-        try:
-            repo = GitRepository.objects.get(slug="devicetype_library")
-        except GitRepository.DoesNotExist:
-            repo = GitRepository(
-                name="Devicetype-library",
-                slug="devicetype_library",
-                remote_url="https://github.com/netbox-community/devicetype-library.git",
-                provided_contents=[
-                    "welcome_wizard.import_wizard",
-                ],
-                branch="master",
-            )
-            repo.save()
 
-        enqueue_pull_git_repository_and_refresh_data(repo, request.user)
+def dashboard_cache_key(model):
+    """Return the cache key used to remember that `model` has data for the dashboard."""
+    return f"welcome_wizard.dashboard.{model._meta.label_lower}"
+
+
+# Cache key of each dashboard model, built once instead of on every dashboard load.
+DASHBOARD_CACHE_KEYS = {entry[0]: dashboard_cache_key(entry[0]) for entry in DASHBOARD_ENTRIES}
+
+
+def models_with_data(models):
+    """Return which of `models` have at least one object, checking all of them in a single query."""
+    if not models:
+        return {}
+    subqueries = ", ".join(
+        f"EXISTS(SELECT 1 FROM {connection.ops.quote_name(model._meta.db_table)})" for model in models
+    )
+    with connection.cursor() as cursor:
+        cursor.execute(f"SELECT {subqueries}")  # nosec
+        row = cursor.fetchone()
+    return {model: bool(exists) for model, exists in zip(models, row)}
+
+
+def check_sync(instance, request):
+    """If Device Type Library is enabled and neither the repository nor data in queryset exist, run the sync."""
+    if not settings.PLUGINS_CONFIG["welcome_wizard"].get("enable_devicetype-library"):
+        return
+    # The sync only needs to be kicked off once, avoid querying for it on every list view render.
+    if cache.get(SYNC_DONE_CACHE_KEY):
+        return
+    # Once the repository exists it is synced (and re-synced) through Nautobot itself.
+    if GitRepository.objects.filter(slug="devicetype_library").exists():
+        cache.set(SYNC_DONE_CACHE_KEY, True, SYNC_DONE_CACHE_TIMEOUT)
+        return
+    if instance.queryset.exists():
+        return
+
+    repo = GitRepository(
+        name="Devicetype-library",
+        slug="devicetype_library",
+        remote_url="https://github.com/netbox-community/devicetype-library.git",
+        provided_contents=[
+            "welcome_wizard.import_wizard",
+        ],
+        branch="master",
+    )
+    repo.save()
+
+    enqueue_pull_git_repository_and_refresh_data(repo, request.user)
+    cache.set(SYNC_DONE_CACHE_KEY, True, SYNC_DONE_CACHE_TIMEOUT)
 
 
 class ManufacturerListView(generic.ObjectListView):
@@ -70,7 +157,7 @@ class DeviceTypeListView(generic.ObjectListView):
 
     permission_required = "welcome_wizard.view_devicetypeimport"
     table = DeviceTypeWizardTable
-    queryset = DeviceTypeImport.objects.prefetch_related("manufacturer")
+    queryset = DeviceTypeImport.objects.select_related("manufacturer")
     filterset = DeviceTypeImportFilterSet
     action_buttons = ()
     template_name = "welcome_wizard/devicetype.html"
@@ -90,27 +177,35 @@ class BulkImportView(View, ObjectPermissionRequiredMixin):
     form = forms.Form
     bulk_import_url = None
     breadcrumb_name = None
-    _permission_action = None
+    job_name = None
+    job_field = None
+    job_kwarg = None
 
     def get_required_permission(self):
         """Return the specific permission necessary to perform the requested action on an object."""
-        return get_permission_for_model(self.queryset.model, self._permission_action)
+        # Each subclass declares its "add" permission statically, so there is nothing to resolve per request.
+        return self.permission_required
 
-    def dispatch(self, request, *args, **kwargs):
-        """Ensures User has permission to add."""
-        # Following Nautobot style of adding self._permission_action inside the dispatch.
-        self._permission_action = "add"  # pylint disable=attribute-defined-outside-init
-        return super().dispatch(request, *args, **kwargs)
+    def get_object_queryset(self):
+        """Return the queryset used to look up the object shown on the single import page."""
+        # The import template only renders the object's name.
+        return self.model.objects.only("name")
 
     def get(self, request):
         """Single Import Page."""
         # The user is expected to get here only by selecting the Import button from a list view.
         if not request.GET.get("pk"):
             return redirect(self.return_url)
-        primarykey = request.GET["pk"]
+        # Reject malformed primary keys before they reach the database.
+        try:
+            primarykey = UUID(request.GET["pk"])
+        except ValueError:
+            return HttpResponseBadRequest("Invalid pk.")
         initial = {"pk": [primarykey]}
 
-        obj = self.model.objects.get(pk=primarykey)
+        obj = self.get_object_queryset().filter(pk=primarykey).first()
+        if obj is None:
+            return redirect(self.return_url)
 
         form = self.form(initial)
 
@@ -132,20 +227,16 @@ class BulkImportView(View, ObjectPermissionRequiredMixin):
             return HttpResponseForbidden()
         form = self.form(request.POST)
         if form.is_valid():
-            pk_list = request.POST.getlist("pk")
-            onboarded = []
-
-            for obj in self.model.objects.filter(pk__in=pk_list):
-                if self.model == ManufacturerImport:
-                    job = Job.objects.get(name="Welcome Wizard - Import Manufacturer")
-                    JobResult.enqueue_job(job_model=job, user=self.request.user, manufacturer_name=obj.name)
-                    onboarded.append(obj.name)
-                elif self.model == DeviceTypeImport:
-                    job = Job.objects.get(name="Welcome Wizard - Import Device Type")
-                    JobResult.enqueue_job(job_model=job, user=self.request.user, filename=obj.filename)
-                    onboarded.append(obj.name)
+            onboarded = 0
+            job = get_job(self.job_name)
+
+            # Validation only loaded the pks, so read just the Job input here, in chunks to bound memory use.
+            values = form.cleaned_data["pk"].values_list(self.job_field, flat=True)
+            for value in values.iterator(chunk_size=500):
+                JobResult.enqueue_job(job_model=job, user=self.request.user, **{self.job_kwarg: value})
+                onboarded += 1
             # Currently treat everything as a success...
-            messages.success(request, f"Onboarded {len(onboarded)} objects.")
+            messages.success(request, f"Onboarded {onboarded} objects.")
 
         return redirect(self.return_url)
 
@@ -160,6 +251,9 @@ class ManufacturerBulkImportView(BulkImportView):
     permission_required = "dcim.add_manufacturer"
     queryset = Manufacturer.objects.all()
     breadcrumb_name = "Import Manufacturers"
+    job_name = "Welcome Wizard - Import Manufacturer"
+    job_field = "name"
+    job_kwarg = "manufacturer_name"
 
 
 class DeviceTypeBulkImportView(BulkImportView):
@@ -170,8 +264,11 @@ class DeviceTypeBulkImportView(BulkImportView):
     return_url = "plugins:welcome_wizard:devicetypes"
     bulk_import_url = "plugins:welcome_wizard:devicetype_import"
     permission_required = "dcim.add_devicetype"
-    queryset = DeviceType.objects.prefetch_related("manufacturer")
+    queryset = DeviceType.objects.select_related("manufacturer")
     breadcrumb_name = "Import Device Types"
+    job_name = "Welcome Wizard - Import Device Type"
+    job_field = "filename"
+    job_kwarg = "filename"
 
 
 class WelcomeWizardDashboard(generic.ObjectListView):
@@ -186,72 +283,50 @@ class WelcomeWizardDashboard(generic.ObjectListView):
     @classmethod
     def check_data(cls):
         """Check data and update the Merlin database."""
-        # Check the status of each of the Merlin Items
-        # To not have a Merlin import set the `wizard_url` to an empty string `""` so that it will not be processed link
-        # wise.
-        for nautobot_object, var_name, list_url, new_url, wizard_url in [
-            (Location, "Locations", "dcim:location_list", "dcim:location_add", ""),
-            (
-                Manufacturer,
-                "Manufacturers",
-                "dcim:manufacturer_list",
-                "dcim:manufacturer_add",
-                "plugins:welcome_wizard:manufacturer_import",
-            ),
-            (
-                DeviceType,
-                "Device Types",
-                "dcim:devicetype_list",
-                "dcim:devicetype_add",
-                "plugins:welcome_wizard:devicetype_import",
-            ),
-            (
-                Role,
-                "Roles",
-                "extras:role_list",
-                "extras:role_add",
-                "",
-            ),
-            (
-                CircuitType,
-                "Circuit Types",
-                "circuits:circuittype_list",
-                "circuits:circuittype_add",
-                "",
-            ),
-            (
-                Provider,
-                "Circuit Providers",
-                "circuits:provider_list",
-                "circuits:provider_add",
-                "",
-            ),
-            (RIR, "RIRs", "ipam:rir_list", "ipam:rir_add", ""),
-            (
-                ClusterType,
-                "VM Cluster Types",
-                "virtualization:clustertype_list",
-                "virtualization:clustertype_add",
-                "",
-            ),
-        ]:
-            completed = nautobot_object.objects.exists()
-            try:
-                Merlin.objects.filter(name=var_name).update(completed=completed)
-                merlin_id = Merlin.objects.get(name=var_name)
-            except Merlin.DoesNotExist:
-                merlin_id = None
-
-            if merlin_id is None:
-                Merlin.objects.create(
-                    name=var_name,
-                    completed=completed,
-                    ignored=False,
-                    nautobot_model=nautobot_object,
-                    nautobot_add_link=new_url,
-                    merlin_link=wizard_url,
-                    nautobot_list_link=list_url,
-                )
+        # Fetch every Merlin row up front and write the changes back in bulk rather than querying per entry.
+        existing = {}
+        for merlin in Merlin.objects.filter(name__in=[entry[1] for entry in DASHBOARD_ENTRIES]):
+            existing.setdefault(merlin.name, []).append(merlin)
+
+        # Only models known to have data are cached, so newly added objects show up on the next page load.
+        cached = cache.get_many(DASHBOARD_CACHE_KEYS.values())
+        has_data = models_with_data([model for model, key in DASHBOARD_CACHE_KEYS.items() if key not in cached])
+        newly_completed = {}
+
+        to_update = []
+        to_create = []
+        for nautobot_object, var_name, list_url, new_url, wizard_url in DASHBOARD_ENTRIES:
+            cache_key = DASHBOARD_CACHE_KEYS[nautobot_object]
+            completed = cached.get(cache_key, False)
+            if not completed:
+                completed = has_data[nautobot_object]
+                if completed:
+                    newly_completed[cache_key] = True
+            # Same defaults as update_or_create would apply, except `ignored` which is left to the user.
+            defaults = {
+                "completed": completed,
+                "nautobot_model": str(nautobot_object),
+                "nautobot_add_link": new_url,
+                "merlin_link": wizard_url,
+                "nautobot_list_link": list_url,
+            }
+            if var_name in existing:
+                for merlin in existing[var_name]:
+                    if any(getattr(merlin, field) != value for field, value in defaults.items()):
+                        for field, value in defaults.items():
+                            setattr(merlin, field, value)
+                        to_update.append(merlin)
+            else:
+                to_create.append(Merlin(name=var_name, ignored=False, **defaults))
+
+        if newly_completed:
+            cache.set_many(newly_completed, timeout=DASHBOARD_CACHE_TIMEOUT)
+        if to_update:
+            Merlin.objects.bulk_update(
+                to_update, ["completed", "nautobot_model", "nautobot_add_link", "merlin_link", "nautobot_list_link"]
+            )
+        if to_create:
+            Merlin.objects.bulk_create(to_create)
 
     def get(self, request, *args, **kwargs):
         """Get request."""